@@ -1,13 +1,16 @@
 from __future__ import annotations
 import argparse
+import concurrent.futures
+import functools
 import os
+import queue
+import random
 import sys
 import shutil
 import threading
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import logging
-import math
 
 try:
     import yt_dlp as ytdlp
@@ -18,59 +21,164 @@ except Exception as e:
 try:
     import tkinter as tk
     from tkinter import ttk, messagebox, filedialog
-    from PIL import Image, ImageTk
     GUI_AVAILABLE = True
 except Exception:
     GUI_AVAILABLE = False
 
 DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "Downloads")
 MAX_RETRIES = 3
+MAX_CONCURRENT_DOWNLOADS = 3
+CONCURRENT_FRAGMENTS = 4
+_VALID_FORMATS = frozenset({"mp4", "mp3"})
 LOG_FORMAT = "%(asctime)s — %(levelname)s — %(message)s"
-logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+class CachedFormatter(logging.Formatter):
+    """Formatter that reuses the strftime() result for records logged within the same second."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached: Tuple[int, Optional[str], str] = (-1, None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        sec = int(record.created)
+        cached_sec, cached_fmt, cached_str = self._cached
+        if sec != cached_sec or datefmt != cached_fmt:
+            cached_str = time.strftime(datefmt or self.default_time_format, self.converter(record.created))
+            self._cached = (sec, datefmt, cached_str)
+        if datefmt or not self.default_msec_format:
+            return cached_str
+        return self.default_msec_format % (cached_str, record.msecs)
+
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(CachedFormatter(LOG_FORMAT))
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 logger = logging.getLogger("ytdl_app")
 
+def _backoff(n: int, cap: float) -> float:
+    """Exponential retry delay for the n-th (0-based) retry, capped at cap seconds."""
+    return min(cap, 0.5 * 2 ** n)
+
+# Static yt-dlp option skeletons; download() layers the per-call keys on top.
+_BASE_OPTS: Dict[str, Any] = {
+    "no_warnings": True,
+    "noplaylist": True,
+    "playlist_items": "1",
+    "lazy_playlist": True,
+    "extractor_retries": 2,
+    "socket_timeout": 15,
+    "file_access_retries": 3,
+    "retry_sleep_functions": {
+        "http": lambda n: _backoff(n, 60),
+        "fragment": lambda n: _backoff(n, 60),
+        "extractor": lambda n: _backoff(n, 30),
+    },
+    "add_metadata": True,
+    "writethumbnail": False,
+}
+_MP4_OPTS: Dict[str, Any] = {
+    **_BASE_OPTS,
+    "format": "bestvideo+bestaudio/best",
+    "merge_output_format": "mp4",
+}
+_MP3_OPTS: Dict[str, Any] = {
+    **_BASE_OPTS,
+    "format": "bestaudio/best",
+    "merge_output_format": "mp4",
+    "postprocessors": [{
+        "key": "FFmpegExtractAudio",
+        "preferredcodec": "mp3",
+        "preferredquality": "192",
+    }, {
+        "key": "FFmpegMetadata"
+    }],
+    "postprocessor_args": {"extractaudio": ["-threads", "0"]},
+}
+
+@functools.lru_cache(maxsize=1)
 def check_ffmpeg_available() -> bool:
     """Return True if ffmpeg executable is available on PATH."""
     return shutil.which("ffmpeg") is not None
 
+@functools.lru_cache(maxsize=32)
+def _ensure_dir(d: str) -> str:
+    """Create d if needed; cached so each directory is only checked once per process."""
+    os.makedirs(d, exist_ok=True)
+    return d
+
 def safe_output_template(output_dir: str = DEFAULT_OUTPUT_DIR) -> str:
     """Return a safe yt-dlp output template inside output_dir."""
-    if not os.path.isdir(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
-    return os.path.join(output_dir, "%(title)s [%(id)s].%(ext)s")
+    return os.path.join(_ensure_dir(output_dir), "%(title)s [%(id)s].%(ext)s")
 
 def human_bytes(n: int) -> str:
     """Pretty-print bytes."""
     if n < 0:
         return "Unknown"
-    units = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while n >= 1024 and i < len(units)-1:
-        n /= 1024.0
-        i += 1
-    return f"{n:.2f} {units[i]}"
+    i = max(0, min(4, (int(n).bit_length() - 1) // 10))
+    return f"{n / (1 << (i * 10)):.2f} {('B', 'KB', 'MB', 'GB', 'TB')[i]}"
+
+def _unwrap_download_error(err: BaseException) -> BaseException:
+    """Return the exception a yt-dlp DownloadError wraps, or err itself."""
+    if isinstance(err, ytdlp.utils.DownloadError):
+        exc_info = getattr(err, "exc_info", None)
+        if exc_info and exc_info[1] is not None:
+            return exc_info[1]
+    return err
+
+def needs_reextract(err: BaseException) -> bool:
+    """Return True if err means the extracted format URLs are stale (HTTP 403/410 or ReExtractInfo)."""
+    err = _unwrap_download_error(err)
+    if isinstance(err, ytdlp.utils.ReExtractInfo):
+        return True
+    status = getattr(err, "status", None) or getattr(err, "code", None)
+    return status in (403, 410)
+
+def is_fatal_error(err: BaseException) -> bool:
+    """Return True if retrying err cannot help (yt-dlp already retried transient network errors)."""
+    err = _unwrap_download_error(err)
+    if isinstance(err, ytdlp.utils.UnsupportedError):
+        return True
+    return isinstance(err, ytdlp.utils.ExtractorError) and bool(getattr(err, "expected", False))
+
+_CTX_MENU_ITEMS = (("Cut", "<<Cut>>"), ("Copy", "<<Copy>>"), ("Paste", "<<Paste>>"), None, ("Select All", "<<SelectAll>>"))
+_CTX_MENU: Optional[tk.Menu] = None
+_CTX_TARGET: Optional[tk.Widget] = None
 
 def add_context_menu(widget: tk.Widget):
     """Attach a right-click context menu (cut/copy/paste/select all) to a widget."""
-    menu = tk.Menu(widget, tearoff=0)
-    menu.add_command(label="Cut", command=lambda: widget.event_generate("<<Cut>>"))
-    menu.add_command(label="Copy", command=lambda: widget.event_generate("<<Copy>>"))
-    menu.add_command(label="Paste", command=lambda: widget.event_generate("<<Paste>>"))
-    menu.add_separator()
-    menu.add_command(label="Select All", command=lambda: widget.event_generate("<<SelectAll>>"))
-
     def show_menu(event):
-        menu.tk_popup(event.x_root, event.y_root)
+        global _CTX_MENU, _CTX_TARGET
+        # Rebuild if the menu belonged to an earlier, since destroyed Tk root.
+        try:
+            alive = _CTX_MENU is not None and bool(_CTX_MENU.winfo_exists())
+        except tk.TclError:
+            alive = False
+        if not alive:
+            _CTX_MENU = tk.Menu(event.widget.winfo_toplevel(), tearoff=0)
+            for item in _CTX_MENU_ITEMS:
+                if item is None:
+                    _CTX_MENU.add_separator()
+                else:
+                    _CTX_MENU.add_command(label=item[0], command=lambda e=item[1]: _CTX_TARGET.event_generate(e))
+        _CTX_TARGET = event.widget
+        _CTX_MENU.tk_popup(event.x_root, event.y_root)
     widget.bind("<Button-3>", show_menu)
 
 class YTDLDownloader:
-    def __init__(self, output_dir: str = DEFAULT_OUTPUT_DIR, verbose: bool = False):
+    def __init__(self, output_dir: str = DEFAULT_OUTPUT_DIR, verbose: bool = False,
+                 progress_queue: Optional[queue.Queue] = None, concurrent_fragments: int = CONCURRENT_FRAGMENTS):
         self.output_dir = output_dir
         self.verbose = verbose
+        self.concurrent_fragments = concurrent_fragments
+        self.progress_queue = progress_queue
         self._last_progress: Dict[str, Any] = {}
-        self._stop_requested = False
+        self._stop_event = threading.Event()
+        self._last_emit_ts = 0.0
+        self._last_emit_bytes = 0
+        self._ydl_cache: Dict[tuple, ytdlp.YoutubeDL] = {}
 
     def _progress_hook(self, d: Dict[str, Any]):
+        if self._stop_event.is_set():
+            raise ytdlp.utils.DownloadCancelled("Download stopped by user.")
         status = d.get("status")
         if status == "downloading":
             downloaded_bytes = d.get("downloaded_bytes", -1)
@@ -88,91 +196,152 @@ class YTDLDownloader:
                 "speed": speed,
                 "eta": eta
             }
-            logger.info(f"Downloading: {percent:.2f}% ({human_bytes(downloaded_bytes)} / {human_bytes(total_bytes)}) ETA {eta}s" if percent is not None else f"Downloading: {human_bytes(downloaded_bytes)}")
+            now = time.monotonic()
+            if downloaded_bytes - self._last_emit_bytes < 262144 and now - self._last_emit_ts < 0.5:
+                return
+            self._last_emit_ts = now
+            self._last_emit_bytes = downloaded_bytes
+            if logger.isEnabledFor(logging.INFO):
+                if percent is not None:
+                    logger.info("Downloading: %.2f%% (%s / %s) ETA %ss", percent,
+                                human_bytes(downloaded_bytes), human_bytes(total_bytes), eta)
+                else:
+                    logger.info("Downloading: %s", human_bytes(downloaded_bytes))
         elif status == "finished":
             logger.info("Download finished; post-processing...")
             self._last_progress = {"status": "finished"}
         elif status == "error":
             logger.error("Download error reported by yt-dlp")
             self._last_progress = {"status": "error"}
+        else:
+            return
+        self._publish(self._last_progress)
+
+    def _publish(self, snapshot: Dict[str, Any]):
+        """Hand a progress snapshot to progress_queue, dropping the oldest one if it is full."""
+        q = self.progress_queue
+        if q is None:
+            return
+        try:
+            q.put_nowait(snapshot)
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                q.put_nowait(snapshot)
+            except queue.Full:
+                pass
 
     def download(self, url: str, output_format: str = "mp4", max_retries: int = MAX_RETRIES) -> str:
-        if output_format not in ("mp4", "mp3"):
+        if output_format not in _VALID_FORMATS:
             raise ValueError("output_format must be 'mp4' or 'mp3'")
 
-        needs_ffmpeg = (output_format == "mp3")
-        if needs_ffmpeg and not check_ffmpeg_available():
-            raise RuntimeError("FFmpeg is required for MP3 conversion but was not found on PATH. Install ffmpeg and try again.")
+        if output_format == "mp3":
+            if not check_ffmpeg_available():
+                raise RuntimeError("FFmpeg is required for MP3 conversion but was not found on PATH. Install ffmpeg and try again.")
+            base_opts = _MP3_OPTS
+        else:
+            base_opts = _MP4_OPTS
 
         outtmpl = safe_output_template(self.output_dir)
         ydl_opts: Dict[str, Any] = {
+            **base_opts,
             "outtmpl": outtmpl,
-            "quiet": False if self.verbose else True,
-            "no_warnings": True,
-            "noplaylist": True,
+            "quiet": not self.verbose,
             "progress_hooks": [self._progress_hook],
-            "format": "bestvideo+bestaudio/best",
             "retries": max_retries,
-            "add_metadata": True,
-            "merge_output_format": "mp4",
-            "writethumbnail": False,
+            "fragment_retries": max_retries,
+            "concurrent_fragment_downloads": self.concurrent_fragments,
         }
 
-        if output_format == "mp3":
-            ydl_opts.update({
-                "format": "bestaudio/best",
-                "postprocessors": [{
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "192",
-                }, {
-                    "key": "FFmpegMetadata"
-                }],
-            })
-        else:
-            ydl_opts.update({
-                "format": "bestvideo+bestaudio/best",
-                "merge_output_format": "mp4",
-            })
-
+        key = (output_format, self.output_dir, max_retries)
         last_err = None
+        probe_info: Optional[Dict[str, Any]] = None
         for attempt in range(1, max_retries + 1):
-            if self._stop_requested:
+            if self._stop_event.is_set():
                 raise RuntimeError("Download stopped by user.")
             try:
                 logger.info(f"Starting download attempt {attempt} for {url}")
-                with ytdlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=True)
-                    ext = "mp3" if output_format == "mp3" else "mp4"
-                    title = info.get("title") or info.get("id")
-                    video_id = info.get("id")
-                    filename = f"{title} [{video_id}].{ext}"
-                    final_path = os.path.join(self.output_dir, filename)
-                    logger.info(f"Finished -> {final_path}")
-                    return final_path
+                ydl = self._ydl_cache.get(key)
+                if ydl is None:
+                    ydl = self._ydl_cache[key] = ytdlp.YoutubeDL(ydl_opts)
+                # Extract once and reuse the resolved info on retries, so a failed
+                # media transfer doesn't re-run the extractor (unless its URLs went stale).
+                if probe_info is None:
+                    probe_info = ydl.extract_info(url, download=False)
+                info = ydl.process_ie_result(dict(probe_info), download=True)
             except Exception as e:
+                if self._stop_event.is_set():
+                    raise RuntimeError("Download stopped by user.") from e
+                if is_fatal_error(e):
+                    raise RuntimeError(f"Download failed: {e}") from e
+                if needs_reextract(e):
+                    probe_info = None
                 last_err = e
                 logger.warning(f"Attempt {attempt} failed: {e}")
-                time.sleep(1 + attempt)
+                if attempt < max_retries:
+                    delay = _backoff(attempt - 1, 60) + random.uniform(0, 0.5)
+                    self._stop_event.wait(timeout=delay)
                 continue
+            final_path = self._final_path(ydl, info, output_format)
+            logger.info(f"Finished -> {final_path}")
+            return final_path
 
         raise RuntimeError(f"All attempts failed. Last error: {last_err}")
 
+    @staticmethod
+    def _final_path(ydl: ytdlp.YoutubeDL, info: Dict[str, Any], output_format: str) -> str:
+        """Return the path yt-dlp actually wrote, after sanitization and post-processing."""
+        if info.get("_type") in ("playlist", "multi_video"):
+            # Channel/user URLs resolve to a one-item playlist (playlist_items="1"); multi_video
+            # results are containers too and carry no top-level requested_downloads.
+            entries = [e for e in info.get("entries") or [] if e and e.get("requested_downloads")]
+            if not entries:
+                raise RuntimeError("No video was downloaded from this playlist URL.")
+            return entries[0]["requested_downloads"][-1]["filepath"]
+        requested = info.get("requested_downloads") or []
+        if requested and requested[-1].get("filepath"):
+            return requested[-1]["filepath"]
+        final_path = ydl.prepare_filename(info)
+        if output_format == "mp3":
+            final_path = os.path.splitext(final_path)[0] + ".mp3"
+        return final_path
+
     def stop(self):
-        self._stop_requested = True
+        self._stop_event.set()
+
+    def reset(self, progress_queue: Optional[queue.Queue] = None):
+        """Prepare an idle downloader for another job, keeping its cached YoutubeDL instances."""
+        self.progress_queue = progress_queue
+        self._last_progress = {}
+        self._stop_event.clear()
+        self._last_emit_ts = 0.0
+        self._last_emit_bytes = 0
+
+    def close(self):
+        """Close any cached YoutubeDL instances."""
+        for ydl in self._ydl_cache.values():
+            try:
+                ydl.close()
+            except Exception:
+                logger.debug("Failed to close YoutubeDL instance", exc_info=True)
+        self._ydl_cache.clear()
 
 def cli_main():
     parser = argparse.ArgumentParser(prog="ytdl_app", description="Download YouTube/TikTok -> MP4 or MP3")
     parser.add_argument("--url", "-u", required=False, help="Video URL (YouTube, TikTok, etc.)")
     parser.add_argument("--format", "-f", choices=["mp4", "mp3"], default="mp4", help="Desired output format")
     parser.add_argument("--output", "-o", default=DEFAULT_OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENT_FRAGMENTS, help="Parallel fragment downloads for HLS/DASH streams")
     parser.add_argument("--gui", action="store_true", help="Open GUI")
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
     args = parser.parse_args()
 
     if args.gui:
         if not GUI_AVAILABLE:
-            print("GUI components unavailable (tkinter/Pillow missing). Install them or run in CLI mode.")
+            print("GUI components unavailable (tkinter missing). Install it or run in CLI mode.")
             sys.exit(1)
         run_gui(default_output=args.output)
         return
@@ -184,17 +353,19 @@ def cli_main():
     if args.verbose:
         logger.setLevel(logging.DEBUG)
 
-    downloader = YTDLDownloader(output_dir=args.output, verbose=args.verbose)
+    downloader = YTDLDownloader(output_dir=args.output, verbose=args.verbose, concurrent_fragments=max(1, args.concurrency))
     try:
         path = downloader.download(args.url, output_format=args.format)
         print(f"Saved: {path}")
     except Exception as e:
         logger.exception("Download failed:")
         print("ERROR:", str(e))
+    finally:
+        downloader.close()
 
 def run_gui(default_output: Optional[str] = None):
     if not GUI_AVAILABLE:
-        raise RuntimeError("GUI libraries (tkinter/pillow) not available")
+        raise RuntimeError("GUI library (tkinter) not available")
 
     root = tk.Tk()
     root.title("YT/TikTok -> MP3/MP4 Downloader")
@@ -207,6 +378,7 @@ def run_gui(default_output: Optional[str] = None):
     url_var = tk.StringVar()
     fmt_var = tk.StringVar(value="mp4")
     out_var = tk.StringVar(value=default_output or DEFAULT_OUTPUT_DIR)
+    frag_var = tk.IntVar(value=CONCURRENT_FRAGMENTS)
     status_var = tk.StringVar(value="Idle")
 
     ttk.Label(frame, text="Video URL:").grid(row=0, column=0, sticky="w")
@@ -218,6 +390,10 @@ def run_gui(default_output: Optional[str] = None):
     fmt_combo = ttk.Combobox(frame, textvariable=fmt_var, values=["mp4", "mp3"], width=8, state="readonly")
     fmt_combo.grid(row=1, column=1, sticky="w")
 
+    ttk.Label(frame, text="Fragments:").grid(row=1, column=2, sticky="w")
+    frag_spin = ttk.Spinbox(frame, from_=1, to=16, textvariable=frag_var, width=4, state="readonly")
+    frag_spin.grid(row=1, column=3, sticky="w")
+
     ttk.Label(frame, text="Output folder:").grid(row=2, column=0, sticky="w")
     out_entry = ttk.Entry(frame, textvariable=out_var, width=48)
     out_entry.grid(row=2, column=1, sticky="w")
@@ -235,14 +411,74 @@ def run_gui(default_output: Optional[str] = None):
     status_label = ttk.Label(frame, textvariable=status_var)
     status_label.grid(row=5, column=0, columnspan=4, sticky="w")
 
-    downloader = YTDLDownloader(output_dir=out_var.get())
-    download_thread: Optional[threading.Thread] = None
+    # Daemon worker threads gated by a semaphore rather than a ThreadPoolExecutor, whose
+    # non-daemon workers would keep the process alive after Quit until every job finished.
+    slots = threading.BoundedSemaphore(MAX_CONCURRENT_DOWNLOADS)
+    closing = False
+    jobs: List[Tuple[YTDLDownloader, concurrent.futures.Future]] = []
+    # Idle downloaders keyed by (format, dir, fragments). A downloader serves one job at a
+    # time (YoutubeDL isn't thread-safe and its progress hooks are bound to the downloader),
+    # but its cached YoutubeDL is reused by later jobs with the same settings.
+    idle: Dict[Tuple[str, str, int], List[YTDLDownloader]] = {}
+    job_keys: Dict[YTDLDownloader, Tuple[str, str, int]] = {}
+    job_states: Dict[YTDLDownloader, Dict[str, Any]] = {}
+    last_pct_int: Optional[int] = None
+
+    pending_value: List[Optional[float]] = [None]
+    scheduled = [False]
 
     def set_status(s: str):
         status_var.set(s)
 
+    def flush_progress():
+        scheduled[0] = False
+        v = pending_value[0]
+        if v is not None:
+            progress["value"] = v
+
+    def set_progress(v: float):
+        # Coalesce bar updates into a single redraw per idle cycle.
+        pending_value[0] = v
+        if not scheduled[0]:
+            scheduled[0] = True
+            root.after_idle(flush_progress)
+
+    def on_done(dl: YTDLDownloader, future: concurrent.futures.Future):
+        jobs[:] = [job for job in jobs if job[1] is not future]
+        job_states.pop(dl, None)
+        idle.setdefault(job_keys.pop(dl), []).append(dl)
+        if future.cancelled():
+            return
+        err = future.exception()
+        if err is not None:
+            set_status("Error: " + str(err))
+            logger.error("Download error", exc_info=err)
+            messagebox.showerror("Download failed", str(err))
+            return
+        path = future.result()
+        set_status(f"Saved: {path}")
+        if not jobs:
+            set_progress(100)
+        messagebox.showinfo("Done", f"Saved: {path}")
+
+    def run_job(dl: YTDLDownloader, future: concurrent.futures.Future, url: str, fmt: str):
+        with slots:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(dl.download(url, output_format=fmt))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def schedule_done(dl: YTDLDownloader, future: concurrent.futures.Future):
+        if closing:
+            return
+        try:
+            root.after(0, on_done, dl, future)
+        except (RuntimeError, tk.TclError):
+            pass  # window destroyed while the job was finishing
+
     def do_download():
-        nonlocal download_thread
         url = url_var.get().strip()
         fmt = fmt_var.get()
         outd = out_var.get().strip()
@@ -252,44 +488,73 @@ def run_gui(default_output: Optional[str] = None):
         if not outd:
             messagebox.showwarning("Missing output folder", "Please choose an output folder.")
             return
-        downloader.output_dir = outd
 
-        def target():
-            try:
-                set_status("Starting download...")
-                path = downloader.download(url, output_format=fmt)
-                set_status(f"Saved: {path}")
-                progress["value"] = 100
-                messagebox.showinfo("Done", f"Saved: {path}")
-            except Exception as e:
-                set_status("Error: " + str(e))
-                logger.exception("Download error")
-                messagebox.showerror("Download failed", str(e))
-
-        download_thread = threading.Thread(target=target, daemon=True)
-        download_thread.start()
-
-        def monitor():
-            st = downloader._last_progress
-            if st.get("status") == "downloading":
-                pct = st.get("percent") or 0.0
-                progress["value"] = max(0, min(100, pct))
-                set_status(f"Downloading: {pct:.1f}% ETA {st.get('eta')}")
-            elif st.get("status") == "finished":
-                progress["value"] = 95
-                set_status("Post-processing...")
-            root.after(500, monitor)
-        monitor()
+        key = (fmt, outd, frag_var.get())
+        if idle.get(key):
+            dl = idle[key].pop()
+            dl.reset(progress_queue=queue.Queue(maxsize=4))
+        else:
+            dl = YTDLDownloader(output_dir=outd, progress_queue=queue.Queue(maxsize=4),
+                                concurrent_fragments=key[2])
+        job_keys[dl] = key
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        jobs.append((dl, future))
+        future.add_done_callback(lambda f: schedule_done(dl, f))
+        threading.Thread(target=run_job, args=(dl, future, url, fmt), daemon=True).start()
+        set_status("Starting download...")
+
+    def refresh_progress():
+        nonlocal last_pct_int
+        states = [job_states.get(dl, {}) for dl, _ in jobs]
+        downloading = [st for st in states if st.get("status") == "downloading"]
+        if downloading:
+            pct = sum(st.get("percent") or 0.0 for st in downloading) / len(downloading)
+            if int(pct) != last_pct_int:
+                last_pct_int = int(pct)
+                set_progress(max(0, min(100, pct)))
+                if len(downloading) == 1:
+                    set_status(f"Downloading: {pct:.1f}% ETA {downloading[0].get('eta')}")
+                else:
+                    set_status(f"Downloading {len(downloading)} files: {pct:.1f}%")
+        elif states and all(st.get("status") == "finished" for st in states) and last_pct_int != -1:
+            last_pct_int = -1
+            set_progress(95)
+            set_status("Post-processing...")
+
+    def monitor():
+        changed = False
+        for dl, _ in jobs:
+            while True:
+                try:
+                    job_states[dl] = dl.progress_queue.get_nowait()
+                    changed = True
+                except queue.Empty:
+                    break
+        if changed:
+            refresh_progress()
+        root.after(500, monitor)
 
     ttk.Button(frame, text="Download", command=do_download).grid(row=3, column=1, sticky="w", pady=8)
-    ttk.Button(frame, text="Quit", command=root.destroy).grid(row=3, column=2, sticky="w", pady=8)
-
+    def quit_app():
+        nonlocal closing
+        closing = True
+        for dl, future in jobs:
+            future.cancel()
+            dl.stop()
+        for pool in idle.values():
+            for dl in pool:
+                dl.close()
+        root.destroy()
+
+    ttk.Button(frame, text="Quit", command=quit_app).grid(row=3, column=2, sticky="w", pady=8)
+    root.protocol("WM_DELETE_WINDOW", quit_app)
+
+    monitor()
     root.mainloop()
 
 if __name__ == "__main__":
     if GUI_AVAILABLE:
         run_gui(default_output=DEFAULT_OUTPUT_DIR)
     else:
-        print("ERROR: GUI not available (tkinter or Pillow missing). Install them via:")
-        print("  pip install pillow")
-        print("And ensure tkinter is installed (usually included with Python).")
+        print("ERROR: GUI not available (tkinter missing).")
+        print("Ensure tkinter is installed (usually included with Python).")